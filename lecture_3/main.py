@@ -4,22 +4,53 @@ The Student Grade Analyzer.
 Program that manage and analyze student grades.
 """
 
+from array import array
+from bisect import bisect_left, insort
+from dataclasses import dataclass, field
+from functools import partial
+from heapq import heappop, heappush
+
+MENU = (
+    "\n--- Student Grade Analyzer ---\n"
+    "1. Add a new student\n"
+    "2. Add grades for a student\n"
+    "3. Show report (all students)\n"
+    "4. Find top performer\n"
+    "5. Exit"
+)
+
+
+@dataclass(slots=True)
+class Student:
+    """
+    A student and their grades.
+    Slots keep each record compact and make attribute access cheap.
+
+    Attributes:
+        name (str): Name as it was entered
+        index (int): Insertion order, breaks ties between equal averages
+        grades (array): Individual grades, one signed byte each (0-100 fits)
+        sum (int): Running total of grades
+        count (int): Number of grades
+    """
+    name: str
+    index: int
+    grades: array = field(default_factory=partial(array, "b"))
+    sum: int = 0
+    count: int = 0
+
 
 def main():
     """
     Runs the grade analyzer program.
     Shows the menu and processes what the user chooses to do.
     """
-    students = []  # List to store all data about student
+    students = {}  # Student records keyed by case-folded name
+    stats = new_stats()  # Aggregates over all student averages
 
     while True:
-        # Display menu
-        print("\n--- Student Grade Analyzer ---")
-        print("1. Add a new student")
-        print("2. Add grades for a student")
-        print("3. Show report (all students)")
-        print("4. Find top performer")
-        print("5. Exit")
+        # Display menu in one write, flushed so it shows up even when output is piped
+        print(MENU, flush=True)
 
         try:
             choice = input("Enter your choice: ").strip()
@@ -30,11 +61,11 @@ def main():
             if choice == "1":
                 add_new_student(students)
             elif choice == "2":
-                add_grades_for_student(students)
+                add_grades_for_student(students, stats)
             elif choice == "3":
-                show_report(students)
+                show_report(students, stats)
             elif choice == "4":
-                find_top_performer(students)
+                find_top_performer(stats)
             elif choice == "5":
                 print("Exiting program.")
                 break
@@ -45,12 +76,54 @@ def main():
             print(f"An error occurred: {e}")
 
 
+def new_stats():
+    """
+    Create empty aggregates for the report summary.
+
+    Returns:
+        dict: Sorted student averages, their running total and a top-performer heap
+    """
+    return {
+        "averages": array("d"),  # per-student averages as contiguous doubles, kept sorted
+        "averages_sum": 0.0,  # running total of the averages
+        "top_heap": []  # (-average, index, count, student), stale entries skipped lazily
+    }
+
+
+def record_grade(student, grade, stats):
+    """
+    Add a grade to a student and update the aggregates.
+
+    Args:
+        student (Student): Student receiving the grade
+        grade (int): Validated grade between 0 and 100
+        stats (dict): Aggregates created by new_stats()
+    """
+    # Drop the student's previous average from the aggregates,
+    # locating it by binary search since the averages are sorted
+    if student.count:
+        old_average = student.sum / student.count
+        averages = stats["averages"]
+        del averages[bisect_left(averages, old_average)]
+        stats["averages_sum"] -= old_average
+
+    student.grades.append(grade)
+    student.sum += grade
+    student.count += 1
+
+    # Insert the new average keeping the list sorted
+    average = student.sum / student.count
+    insort(stats["averages"], average)
+    stats["averages_sum"] += average
+    heappush(stats["top_heap"], (-average, student.index, student.count, student))
+
+
 def add_new_student(students):
     """
     Adds another student to our records.
 
     Args:
-     students (list): Current list of all students we're tracking
+     students (dict): All students we're tracking, keyed by case-folded name
     """
     name = input("Enter student name: ").strip()
     if not name:
@@ -58,26 +131,24 @@ def add_new_student(students):
         return
 
     # Check if student already exists
-    for student in students:
-        if student["name"].lower() == name.lower():
-            print(f"Student '{name}' already exists.")
-            return
-
-    # New student dictionary with empty grades list
-    new_student = {
-        "name": name,
-        "grades": []  # individual grades
-    }
-    students.append(new_student)
+    key = name.casefold()
+    if key in students:
+        print(f"Student '{name}' already exists.")
+        return
+
+    # New student with empty grades list
+    new_student = Student(name=name, index=len(students))
+    students[key] = new_student
     print(f"Student '{name}' added successfully.")
 
 
-def add_grades_for_student(students):
+def add_grades_for_student(students, stats):
     """
     Add grades for an existing student.
 
     Args:
-        students (list): List of student dictionaries
+        students (dict): Students keyed by case-folded name
+        stats (dict): Aggregates updated with every new grade
     """
     name = input("Enter student name: ").strip()
     if not name:
@@ -85,47 +156,60 @@ def add_grades_for_student(students):
         return
 
     # Find the student
-    student_found = None
-    for student in students:
-        if student["name"].lower() == name.lower():
-            student_found = student
-            break
+    student_found = students.get(name.casefold())
 
     # Message if student not found
     if student_found is None:
         print(f"Student '{name}' not found.")
         return
 
-    print(f"Adding grades for {student_found['name']}. Enter 'done' to finish.")
+    print(f"Adding grades for {student_found.name}. "
+          "Several grades can be entered on one line, separated by spaces or commas. "
+          "Enter 'done' to finish.")
 
     while True:
-        grade_input = input("Enter a grade (or 'done' to finish): ").strip()
-        if not grade_input:
+        grade_input = input("Enter grades (or 'done' to finish): ").strip()
+        tokens = grade_input.replace(",", " ").split()
+        if not tokens:
             print("Error: Input cannot be empty. Please enter a grade or 'done'.")
             continue
 
         # Exit
         if grade_input.lower() == 'done':
             break
-        try:
-            # Validate and convert grade
-            grade = int(grade_input)
-            if grade < 0 or grade > 100:
-                print("Invalid grade. Please enter a number between 0 and 100.")
-            else:
-                # Add valid grade to student's record
-                student_found["grades"].append(grade)
-                print(f"Grade {grade} added successfully.")
-        except ValueError:
-            print("Invalid input. Please enter a number.")
 
+        # Validate every grade on the line, report problems once at the end
+        added = []
+        invalid = []
+        for token in tokens:
+            # Only plain digits up to three characters, no exception on bad input
+            if not (token.isdecimal() and len(token) <= 3):
+                invalid.append(token)
+                continue
+            grade = int(token)
+            if grade > 100:
+                invalid.append(token)
+                continue
+
+            # Add valid grade to student's record
+            record_grade(student_found, grade, stats)
+            added.append(token)
+
+        if added:
+            label = "Grade" if len(added) == 1 else "Grades"
+            print(f"{label} {', '.join(added)} added successfully.")
+        if invalid:
+            print(f"Skipped invalid input: {', '.join(invalid)}. "
+                  "Please enter numbers between 0 and 100.")
 
-def show_report(students):
+
+def show_report(students, stats):
     """
     Generate full student report with statistics.
 
     Args:
-        students (list): Student data to display
+        students (dict): Student data to display, keyed by case-folded name
+        stats (dict): Precomputed aggregates over student averages
     """
     if not students:
         print("No students available.")
@@ -133,60 +217,52 @@ def show_report(students):
 
     print("\n--- Student Report ---")
 
-    averages = []  # List to store average grades
-
-    for student in students:
-        try:
-            # Skip students with no grades
-            if not student["grades"]:
-                print(f"{student['name']}'s average grade is N/A.")
-                continue
-
-            # Calculate student average
-            average = sum(student["grades"]) / len(student["grades"])
-            averages.append(average)
-            print(f"{student['name']}'s average grade is {average:.1f}.")
-
-        except ZeroDivisionError:
-            print(f"{student['name']}'s average grade is N/A.")
+    # Build all report lines in one pass and print them together
+    lines = [
+        f"{student.name}'s average grade is {student.sum / student.count:.1f}."
+        if student.count else f"{student.name}'s average grade is N/A."
+        for student in students.values()
+    ]
+    print("\n".join(lines))
 
-    # Calculate and show statistics
+    # Show statistics from the precomputed aggregates
+    averages = stats["averages"]
     if averages:
-        max_avg = max(averages)
-        min_avg = min(averages)
-        overall_avg = sum(averages) / len(averages)
+        max_avg = averages[-1]
+        min_avg = averages[0]
+        overall_avg = stats["averages_sum"] / len(averages)
 
         print("---")
         print(f"Max Average: {max_avg:.1f}")
         print(f"Min Average: {min_avg:.1f}")
-        print(f"Overall Average: {overall_avg:.1f}")
+        print(f"Overall Average: {overall_avg:.1f}", flush=True)
     else:
-        print("No students with grades available for summary statistics.")
+        print("No students with grades available for summary statistics.", flush=True)
 
 
-def find_top_performer(students):
+def find_top_performer(stats):
     """
     Find and display the student with the highest average grade.
 
     Args:
-        students (list): List of student dictionaries
+        stats (dict): Aggregates holding the top-performer heap
     """
-    # Filter out students without grades
-    students_with_grades = [s for s in students if s["grades"]]
+    top_heap = stats["top_heap"]
 
-    if not students_with_grades:
+    # Discard entries recorded before the student's latest grade
+    while top_heap and top_heap[0][2] != top_heap[0][3].count:
+        heappop(top_heap)
+
+    if not top_heap:
         print("No students with grades available.")
         return
 
     try:
-        # Find student with the highest average
-        top_student = max(students_with_grades,
-                          key=lambda student: sum(student["grades"]) / len(student["grades"]))
-
-        # Calculate the top average
-        top_average = sum(top_student["grades"]) / len(top_student["grades"])
+        # Student with the highest average sits at the top of the heap
+        neg_average, _, _, top_student = top_heap[0]
+        top_average = -neg_average
 
-        print(f"The student with the highest average is {top_student['name']} with a grade of {top_average:.1f}.")
+        print(f"The student with the highest average is {top_student.name} with a grade of {top_average:.1f}.", flush=True)
 
     except Exception as e:
         print(f"Error finding top performer: {e}")
@@ -4,11 +4,17 @@ Built with FastAPI and SQLAlchemy ORM
 """
 
 # Import necessary libraries and modules
-from fastapi import FastAPI, Depends, HTTPException, Query
-from sqlalchemy import create_engine, Column, Integer, String
+import json
+from contextlib import asynccontextmanager
+from functools import lru_cache
+from uuid import uuid4
+
+from fastapi import FastAPI, Depends, Header, HTTPException, Query, Response
+from fastapi.responses import StreamingResponse
+from sqlalchemy import create_engine, event, insert, select, update, Column, Integer, String
 from sqlalchemy.ext.declarative import declarative_base
 from sqlalchemy.orm import sessionmaker, Session
-from pydantic import BaseModel
+from pydantic import BaseModel, ConfigDict, TypeAdapter
 from typing import Optional, List
 
 
@@ -39,14 +45,17 @@ class BookResponse(BaseModel):
     Pydantic model for API response.
     This is what we return to the user.
     """
+    model_config = ConfigDict(from_attributes=True)  # ORM compatibility
+
     id: int
     title: str
     author: str
     year: Optional[int]
 
-    class Config:
-        """Pydantic configuration for ORM compatibility"""
-        from_attributes = True
+
+# Adapters built once at import and reused for every request
+books_adapter = TypeAdapter(List[BookResponse])  # serializes book lists
+books_create_adapter = TypeAdapter(List[BookCreate])  # dumps bulk request bodies
 
 
 # Database setup
@@ -60,8 +69,27 @@ engine = create_engine(
     connect_args={"check_same_thread": False}  # Required for SQLite
 )
 
+
+@event.listens_for(engine, "connect")
+def set_sqlite_pragmas(dbapi_connection, connection_record):
+    """
+    Tunes every new SQLite connection.
+    WAL lets reads run alongside a write, and synchronous=NORMAL skips
+    the fsync on each commit (still safe against corruption in WAL mode).
+    """
+    cursor = dbapi_connection.cursor()
+    cursor.execute("PRAGMA journal_mode=WAL")
+    cursor.execute("PRAGMA synchronous=NORMAL")
+    cursor.execute("PRAGMA temp_store=MEMORY")
+    cursor.execute("PRAGMA mmap_size=268435456")  # 256 MB
+    cursor.execute("PRAGMA cache_size=-20000")  # ~20 MB page cache
+    cursor.close()
+
+
 # Create session factory
-SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
+# expire_on_commit=False keeps loaded attributes valid after commit,
+# so returning a just-written book doesn't trigger another SELECT
+SessionLocal = sessionmaker(autocommit=False, autoflush=False, expire_on_commit=False, bind=engine)
 
 # Base class for ORM models
 Base = declarative_base()
@@ -78,22 +106,34 @@ class BookDB(Base):
 
     # Columns/fields in the table
     id = Column(Integer, primary_key=True, index=True)  # Primary key
-    title = Column(String, nullable=False)
-    author = Column(String, nullable=False)
-    year = Column(Integer, nullable=True)  # Optional field
+    title = Column(String, nullable=False, index=True)
+    author = Column(String, nullable=False, index=True)
+    year = Column(Integer, nullable=True, index=True)  # Optional field, exact-match search
+
 
+def init_db():
+    """
+    Create all tables in the database.
+    This will create the 'books' table if it doesn't exist
+    """
+    Base.metadata.create_all(bind=engine)
 
-# Create all tables in the database
-# This will create the 'books' table if it doesn't exist
-Base.metadata.create_all(bind=engine)
 
 # FastAPI application
 
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    """Prepares the database on startup, so importing this module doesn't touch disk"""
+    init_db()
+    yield
+
+
 # Initialize FastAPI application
 app = FastAPI(
     title="Simple Book Collection API",
     description="A REST API for managing personal book collection",
-    version="1.0.0"
+    version="1.0.0",
+    lifespan=lifespan
 )
 
 
@@ -108,6 +148,36 @@ def get_db():
         db.close()  # Always close session
 
 
+# Cache for book list pages
+
+# Bumped after every write, so cached pages of an older version are never served.
+# The counter lives in this process: run a single worker when relying on it.
+books_version = 0
+
+# Changes on every restart, so ETags handed out by a previous run never match
+BOOKS_ETAG_PREFIX = uuid4().hex[:8]
+
+
+def bump_books_version():
+    """Marks cached book pages as outdated after a write"""
+    global books_version
+    books_version += 1
+
+
+@lru_cache(maxsize=64)
+def render_books_page(version: int, limit: int, offset: int) -> bytes:
+    """
+    Query and serialize one page of books.
+    Results are memoized per (version, limit, offset); `version` is only part of the key.
+    """
+    with SessionLocal() as db:
+        stmt = select(BookDB).order_by(BookDB.id).offset(offset).limit(limit)
+        books = db.scalars(stmt).all()
+
+        # Validate from ORM attributes, then serialize straight to JSON bytes
+        return books_adapter.dump_json(books_adapter.validate_python(books))
+
+
 # API endpoints
 
 @app.post("/books/", response_model=BookResponse, status_code=201)
@@ -130,17 +200,46 @@ def create_book(book: BookCreate, db: Session = Depends(get_db)):
 
     # Add to database session
     db.add(db_book)
-    db.commit()  # Save changes to database
-    db.refresh(db_book)  # Refresh to get auto-generated ID
+    db.commit()  # Save changes to database, the auto-generated ID is set on flush
+    bump_books_version()
 
     return db_book
 
 
+@app.post("/books/bulk", response_model=List[BookResponse], status_code=201)
+def create_books(books: List[BookCreate], db: Session = Depends(get_db)):
+    """
+    Create several books in one request.
+    All rows are inserted with a single statement and committed once.
+    Example JSON request:
+        [
+            {"title": "Some book", "author": "Ekaterina", "year": 2025},
+            {"title": "Another book", "author": "Ekaterina"}
+        ]
+    """
+    if not books:
+        return []
+
+    # Insert all rows at once, RETURNING gives back the created books in request order
+    rows = books_create_adapter.dump_python(books)
+    stmt = insert(BookDB).returning(BookDB, sort_by_parameter_order=True)
+    db_books = db.scalars(stmt, rows).all()
+    db.commit()  # One commit for the whole batch
+    bump_books_version()
+
+    return db_books
+
+
 @app.get("/books/", response_model=List[BookResponse])
-def get_all_books(db: Session = Depends(get_db)):
+def get_all_books(
+        limit: int = Query(100, ge=1, le=1000, description="Maximum number of books to return"),
+        offset: int = Query(0, ge=0, description="Number of books to skip"),
+        if_none_match: Optional[str] = Header(None)
+):
     """
-    Get all books from the collection.
-    Returns: All books in the collection
+    Get books from the collection, one page at a time.
+    Returns: Up to `limit` books ordered by ID, starting after `offset`.
+    Pages are cached until the next write; a matching If-None-Match gets 304 Not Modified.
 
     Example response:
         [
@@ -152,9 +251,37 @@ def get_all_books(db: Session = Depends(get_db)):
             }
         ]
     """
-    # Query all books from database
-    books = db.query(BookDB).all()
-    return books
+    version = books_version
+    etag = f'"{BOOKS_ETAG_PREFIX}-{version}"'
+
+    # Client already has this version of the collection
+    if if_none_match == etag:
+        return Response(status_code=304, headers={"ETag": etag})
+
+    body = render_books_page(version, limit, offset)
+    return Response(body, media_type="application/json", headers={"ETag": etag})
+
+
+def iter_books_ndjson():
+    """Yields every book as one JSON line, loading rows in small batches"""
+    # Own session: it has to stay open until the last line is sent
+    with SessionLocal() as db:
+        books = db.scalars(select(BookDB).order_by(BookDB.id).execution_options(yield_per=200))
+        for book in books:
+            yield BookResponse.model_validate(book).model_dump_json().encode() + b"\n"
+
+
+@app.get("/books/stream")
+def stream_books():
+    """
+    Stream the whole collection as newline-delimited JSON.
+    Memory use stays flat no matter how many books there are.
+
+    Example response:
+        {"id": 1, "title": "Easy Python", "author": "Lubanovich", "year": 2019}
+        {"id": 2, "title": "Some book", "author": "Ekaterina", "year": 2025}
+    """
+    return StreamingResponse(iter_books_ndjson(), media_type="application/x-ndjson")
 
 
 @app.get("/books/search/", response_model=List[BookResponse])
@@ -168,19 +295,19 @@ def search_books(
     Search books by title, author, or year.
     Returns: Books matching the search criteria
     """
-    # Start with base query
-    query = db.query(BookDB)
+    # Start with base statement
+    stmt = select(BookDB)
 
     # Add filters based on provided parameters
     if title:
-        query = query.filter(BookDB.title.contains(title))
+        stmt = stmt.where(BookDB.title.contains(title))
     if author:
-        query = query.filter(BookDB.author.contains(author))
+        stmt = stmt.where(BookDB.author.contains(author))
     if year:
-        query = query.filter(BookDB.year == year)
+        stmt = stmt.where(BookDB.year == year)
 
-    # Execute query and return results
-    return query.all()
+    # Execute statement and return results
+    return db.scalars(stmt).all()
 
 
 @app.put("/books/{book_id}", response_model=BookResponse)
@@ -200,24 +327,29 @@ def update_book(
             "year": 2025
         }
     """
-    # Find book in database
-    db_book = db.query(BookDB).filter(BookDB.id == book_id).first()
+    # Only the fields that were provided
+    values = book_update.model_dump(exclude_none=True)
+
+    if not values:
+        # Nothing to change, just return the current book
+        db_book = db.get(BookDB, book_id)
+    else:
+        # Update and read back the row in a single statement
+        stmt = (
+            update(BookDB)
+            .where(BookDB.id == book_id)
+            .values(**values)
+            .returning(BookDB)
+        )
+        db_book = db.scalars(stmt).one_or_none()
 
     # Check if book exists
     if not db_book:
         raise HTTPException(status_code=404, detail="Book not found")
 
-    # Update only the fields that were provided
-    if book_update.title is not None:
-        db_book.title = book_update.title
-    if book_update.author is not None:
-        db_book.author = book_update.author
-    if book_update.year is not None:
-        db_book.year = book_update.year
-
     # Save changes
     db.commit()
-    db.refresh(db_book)
+    bump_books_version()
 
     return db_book
 
@@ -235,7 +367,7 @@ def delete_book(book_id: int, db: Session = Depends(get_db)):
         {"message": "Book deleted successfully"}
     """
     # Find book in database
-    db_book = db.query(BookDB).filter(BookDB.id == book_id).first()
+    db_book = db.get(BookDB, book_id)
 
     # Check if book exists
     if not db_book:
@@ -244,11 +376,28 @@ def delete_book(book_id: int, db: Session = Depends(get_db)):
     # Delete book from database
     db.delete(db_book)
     db.commit()
+    bump_books_version()
 
     return {"message": "Book deleted successfully"}
 
 # Root endpoint (health check)
 
+# The root response never changes, so it is serialized once at import
+ROOT_BODY = json.dumps({
+    "message": "Welcome to Book Collection API",
+    "docs": "Visit /docs for Swagger UI documentation",
+    "endpoints": [
+        "POST /books/ - Add new book",
+        "POST /books/bulk - Add several books",
+        "GET /books/ - Get books (paginated with limit/offset)",
+        "GET /books/stream - Stream all books as NDJSON",
+        "GET /books/search/ - Search books",
+        "PUT /books/{id} - Update book",
+        "DELETE /books/{id} - Delete book"
+    ]
+}).encode()
+
+
 @app.get("/")
 def read_root():
     """
@@ -256,17 +405,7 @@ def read_root():
 
     Returns: Welcome message and API status
     """
-    return {
-        "message": "Welcome to Book Collection API",
-        "docs": "Visit /docs for Swagger UI documentation",
-        "endpoints": [
-            "POST /books/ - Add new book",
-            "GET /books/ - Get all books",
-            "GET /books/search/ - Search books",
-            "PUT /books/{id} - Update book",
-            "DELETE /books/{id} - Delete book"
-        ]
-    }
+    return Response(ROOT_BODY, media_type="application/json")
 
 
 # Application entry point